@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Currency
+
+
+@admin.register(Currency)
+class CurrencyAdmin(admin.ModelAdmin):
+    list_display = ("code", "name", "nominal", "is_active", "is_available")
+    list_editable = ("is_active",)
+    list_filter = ("is_active", "is_available")
+    search_fields = ("code", "name")
+    readonly_fields = ("is_available", "updated_at")
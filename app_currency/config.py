@@ -1,4 +1,4 @@
-# Поддерживаемые валюты
+# Валюты, включенные по умолчанию (остальные из каталога ЦБ выключены)
 SUPPORTED_CURRENCIES = ["USD", "EUR"]
 
 # Ссылки на источник данных
@@ -17,11 +17,30 @@ CACHE_SETTINGS = {
     "KEY_PREFIX": "exchange_last_request_",
 }
 
+# Настройки каталога валют
+CATALOGUE_SETTINGS = {
+    "INDEX_KEY": "currency_catalogue_index",  # Ключ индекса в кэше
+    "INDEX_TTL": 30,  # Время жизни индекса (сек), за него изменения
+    # каталога доходят до всех процессов сервера
+    "SYNC_KEY": "currency_catalogue_synced",  # Ключ времени синхронизации
+    "SYNC_INTERVAL": 3600,  # Период синхронизации с источником (сек)
+}
+
 # Настройки базы данных
 DB_SETTINGS = {
     "DEFAULT_RATE_LIMIT": 10,  # Количество записей в истории
 }
 
+# Настройки трассировки и профилирования запросов
+TRACING_SETTINGS = {
+    "LOGGER": "app_currency.tracing",  # Лог по этапам запроса (всегда)
+    "HEADER": None,  # Заголовок Server-Timing (None - как settings.DEBUG)
+    "PROFILE": False,  # Профилирование запросов через cProfile
+    "PROFILE_SAMPLE_RATE": 1.0,  # Доля профилируемых запросов (0..1)
+    "PROFILE_TOP_N": 10,  # Сколько отчетов самых медленных запросов хранить
+    "PROFILE_DIR": "profiles",  # Каталог для отчетов (от BASE_DIR)
+}
+
 # Настройки ответов
 RESPONSE_SETTINGS = {
     "indent": 2,
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_currency.services.catalogue import CurrencyCatalogue
+from app_currency.services.currency_fetchers import CBRRateFetcher
+
+
+class Command(BaseCommand):
+    help = "Синхронизирует каталог валют с данными ЦБ"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--enable", nargs="+", default=[], help="Включить валюты"
+        )
+        parser.add_argument(
+            "--disable", nargs="+", default=[], help="Выключить валюты"
+        )
+
+    def handle(self, *args, **options):
+        catalogue = CurrencyCatalogue()
+
+        try:
+            data = CBRRateFetcher.fetch_data()
+        except Exception as e:
+            raise CommandError(f"Не удалось получить данные ЦБ: {e}")
+        catalogue.sync(data.get("Valute", {}))
+
+        for code in options["enable"]:
+            if not catalogue.set_active(code, True):
+                self.stderr.write(f"Валюта {code.upper()} не найдена")
+        for code in options["disable"]:
+            if not catalogue.set_active(code, False):
+                self.stderr.write(f"Валюта {code.upper()} не найдена")
+
+        codes = ", ".join(sorted(catalogue.get_codes()))
+        self.stdout.write(self.style.SUCCESS(f"Включенные валюты: {codes}"))
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+
+def seed_currencies(apps, _schema_editor):
+    """Заполняем каталог валютами, которые поддерживались ранее"""
+    currency = apps.get_model("app_currency", "Currency")
+    for code in ["USD", "EUR"]:
+        currency.objects.get_or_create(
+            code=code, defaults={"is_active": True}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_currency", "0002_exchangerate_currency"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Currency",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=3, unique=True)),
+                ("name", models.CharField(blank=True, max_length=100)),
+                ("nominal", models.PositiveIntegerField(default=1)),
+                ("is_active", models.BooleanField(default=False)),
+                ("is_available", models.BooleanField(default=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["code"],
+            },
+        ),
+        migrations.RunPython(seed_currencies, migrations.RunPython.noop),
+    ]
@@ -27,3 +27,29 @@ class ExchangeRate(models.Model):
             "currency": self.currency,
             "timestamp": self.timestamp_readable,
         }
+
+
+class Currency(models.Model):
+    """Валюта из каталога источника данных"""
+
+    objects: Manager
+    code = models.CharField(max_length=3, unique=True)
+    name = models.CharField(max_length=100, blank=True)
+    nominal = models.PositiveIntegerField(default=1)
+    is_active = models.BooleanField(default=False)
+    is_available = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["code"]
+
+    def __str__(self):
+        return self.code
+
+    def to_dict(self):
+        """Сериализация в словарь"""
+        return {
+            "code": self.code,
+            "name": self.name,
+            "nominal": self.nominal,
+        }
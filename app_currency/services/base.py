@@ -7,6 +7,8 @@ from django.utils import timezone
 from app_currency.config import CACHE_SETTINGS, DB_SETTINGS
 from app_currency.models import ExchangeRate
 
+from .tracing import span
+
 
 class RateFetcher(ABC):
     """Абстрактный класс, для получения курса валют"""
@@ -35,7 +37,8 @@ class CacheManager:
 
     def check_make_request(self) -> tuple[bool, str]:
         """Проверяем, таймер запроса"""
-        last_request = cache.get(self.cache_key)
+        with span("cache_check"):
+            last_request = cache.get(self.cache_key)
         now = timezone.now()
 
         if (
@@ -49,7 +52,8 @@ class CacheManager:
 
     def update_cache(self):
         """Обновляем время последнего запроса в кэше"""
-        cache.set(self.cache_key, timezone.now(), timeout=self.cooldown)
+        with span("cache_update"):
+            cache.set(self.cache_key, timezone.now(), timeout=self.cooldown)
 
 
 class DataBaseManager:
@@ -66,9 +70,10 @@ class DataBaseManager:
 
     def save_rate(self, rate: float) -> ExchangeRate:
         """Сохраняем курс валют в БД"""
-        return ExchangeRate.objects.create(
-            rate=rate, currency=self.currency_code
-        )
+        with span("save_rate"):
+            return ExchangeRate.objects.create(
+                rate=rate, currency=self.currency_code
+            )
 
     def get_last_rates(
         self,
@@ -76,18 +81,20 @@ class DataBaseManager:
         exclude_latest: bool = False,
     ) -> list:
         """Получаем последние 10 запросов, по курсу этой валюты"""
-        queryset = ExchangeRate.objects.filter(currency=self.currency_code)
-        if exclude_latest:
-            # Получаем ID Самой последней записи
-            latest = queryset.order_by("-timestamp").first()
-            if latest:
-                queryset = queryset.exclude(id=latest.id)
+        with span("history"):
+            queryset = ExchangeRate.objects.filter(currency=self.currency_code)
+            if exclude_latest:
+                # Получаем ID Самой последней записи
+                latest = queryset.order_by("-timestamp").first()
+                if latest:
+                    queryset = queryset.exclude(id=latest.id)
 
-        rates = queryset.order_by("-timestamp")[:limit]
-        return [rate.to_dict() for rate in rates]
+            rates = queryset.order_by("-timestamp")[:limit]
+            return [rate.to_dict() for rate in rates]
 
     def get_last_rate(self) -> Optional[ExchangeRate]:
         """Получаем последний сохраненный курс текущий валюты"""
-        return ExchangeRate.objects.filter(currency=self.currency_code).latest(
-            "timestamp"
-        )
+        with span("last_rate"):
+            return ExchangeRate.objects.filter(
+                currency=self.currency_code
+            ).latest("timestamp")
@@ -0,0 +1,119 @@
+from django.core.cache import cache
+from django.utils import timezone
+
+from app_currency.config import CATALOGUE_SETTINGS, SUPPORTED_CURRENCIES
+from app_currency.models import Currency
+
+
+class CurrencyCatalogue:
+    """Класс для работы с каталогом валют.
+    Индекс включенных валют хранится в кэше, поэтому проверка
+    поддержки валюты не требует запроса к БД. Кэш может быть локальным
+    для процесса, поэтому индекс живет INDEX_TTL секунд
+    """
+
+    INDEX_KEY = CATALOGUE_SETTINGS["INDEX_KEY"]
+    INDEX_TTL = CATALOGUE_SETTINGS["INDEX_TTL"]
+    SYNC_KEY = CATALOGUE_SETTINGS["SYNC_KEY"]
+    SYNC_INTERVAL = CATALOGUE_SETTINGS["SYNC_INTERVAL"]
+
+    def get_index(self) -> dict:
+        """Возвращаем индекс включенных валют: {код: метаданные}"""
+        index = cache.get(self.INDEX_KEY)
+        if index is None:
+            currencies = Currency.objects.filter(
+                is_active=True, is_available=True
+            )
+            index = {
+                currency.code: currency.to_dict() for currency in currencies
+            }
+            cache.set(self.INDEX_KEY, index, timeout=self.INDEX_TTL)
+        return index
+
+    def get_codes(self) -> frozenset:
+        """Возвращаем коды включенных валют"""
+        return frozenset(self.get_index())
+
+    def is_supported(self, currency_code: str) -> bool:
+        """Проверяем, включена ли валюта"""
+        return currency_code.upper() in self.get_index()
+
+    def invalidate(self):
+        """Сбрасываем индекс в кэше текущего процесса,
+        остальные процессы перестроят его по истечении INDEX_TTL
+        """
+        cache.delete(self.INDEX_KEY)
+
+    def set_active(self, currency_code: str, is_active: bool) -> bool:
+        """
+        Включаем или выключаем валюту
+        :return: True, если валюта есть в каталоге
+        """
+        updated = Currency.objects.filter(
+            code=currency_code.upper()
+        ).update(is_active=is_active, updated_at=timezone.now())
+        self.invalidate()
+        return bool(updated)
+
+    def needs_sync(self) -> bool:
+        """Проверяем, истек ли период синхронизации с источником"""
+        return cache.get(self.SYNC_KEY) is None
+
+    def sync(self, valute: dict):
+        """
+        Обновляем каталог по данным источника.
+        Новые валюты добавляются выключенными (кроме SUPPORTED_CURRENCIES),
+        валюты, пропавшие из источника, помечаются недоступными
+        :param valute: раздел "Valute" ответа ЦБ
+        """
+        now = timezone.now()
+        # Отмечаем синхронизацию заранее: при ошибке повтор будет только
+        # через SYNC_INTERVAL, а не на каждом запросе курса
+        cache.set(self.SYNC_KEY, now, timeout=self.SYNC_INTERVAL)
+
+        existing = {
+            currency.code: currency for currency in Currency.objects.all()
+        }
+        to_create, to_update = [], []
+
+        for code, item in valute.items():
+            code = code.upper()
+            name = item.get("Name", "")
+            nominal = int(item.get("Nominal", 1))
+            currency = existing.pop(code, None)
+
+            if currency is None:
+                to_create.append(
+                    Currency(
+                        code=code,
+                        name=name,
+                        nominal=nominal,
+                        is_active=code in SUPPORTED_CURRENCIES,
+                    )
+                )
+            elif (
+                currency.name != name
+                or currency.nominal != nominal
+                or not currency.is_available
+            ):
+                currency.name = name
+                currency.nominal = nominal
+                currency.is_available = True
+                currency.updated_at = now
+                to_update.append(currency)
+
+        # Оставшиеся валюты отсутствуют в источнике
+        for currency in existing.values():
+            if currency.is_available:
+                currency.is_available = False
+                currency.updated_at = now
+                to_update.append(currency)
+
+        # Другой процесс мог одновременно добавить те же валюты
+        Currency.objects.bulk_create(to_create, ignore_conflicts=True)
+        Currency.objects.bulk_update(
+            to_update, ["name", "nominal", "is_available", "updated_at"]
+        )
+
+        if to_create or to_update:
+            self.invalidate()
@@ -1,10 +1,15 @@
+import logging
 from typing import Optional
 
 import requests
 
-from app_currency.config import API_SETTINGS, API_URLS, SUPPORTED_CURRENCIES
+from app_currency.config import API_SETTINGS, API_URLS
 
 from .base import RateFetcher
+from .catalogue import CurrencyCatalogue
+from .tracing import span
+
+logger = logging.getLogger(__name__)
 
 
 class CBRRateFetcher(RateFetcher):
@@ -15,15 +20,36 @@ class CBRRateFetcher(RateFetcher):
 
     def __init__(self, currency_code):
         self.currency = currency_code.upper()
+        self.catalogue = CurrencyCatalogue()
 
-        if self.currency not in SUPPORTED_CURRENCIES:
+        if not self.catalogue.is_supported(self.currency):
             raise ValueError(f"Валюта {self.currency} не поддерживается")
 
+    @classmethod
+    def fetch_data(cls) -> dict:
+        """Получаем полный ответ ЦБ со всеми валютами"""
+        with span("fetch"):
+            response = requests.get(cls.API_URL, timeout=cls.TIMEOUT)
+            response.raise_for_status()
+        with span("parse"):
+            return response.json()
+
+    def _sync_catalogue(self, valute: dict):
+        """Периодически обновляем каталог валют по полученным данным.
+        Ошибка синхронизации не должна мешать получению курса
+        """
+        if not self.catalogue.needs_sync():
+            return
+        try:
+            with span("catalogue_sync"):
+                self.catalogue.sync(valute)
+        except Exception as e:
+            logger.error(f"Ошибка при синхронизации каталога валют: {e}")
+
     def get_rate(self) -> Optional[float]:
-        response = requests.get(self.API_URL, timeout=self.TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-        rate = data.get("Valute", {}).get(self.currency, {}).get("Value", None)
+        valute = self.fetch_data().get("Valute", {})
+        rate = valute.get(self.currency, {}).get("Value", None)
+        self._sync_catalogue(valute)
         return None if rate is None else float(rate)
 
     def get_currency_code(self) -> str:
@@ -4,6 +4,7 @@ from django.utils import timezone
 from app_currency.config import CACHE_SETTINGS, RESPONSE_SETTINGS, TIME_FORMATS
 
 from .base import CacheManager, DataBaseManager, RateFetcher
+from .tracing import RequestTrace, set_data_source, span
 
 
 class ExchangeService:
@@ -70,6 +71,8 @@ class ExchangeService:
         Основной метод: получаем курс, сохраняем в БД и получаем результат
         :return: Словарь с результатом
         """
+        set_data_source("api")
+
         # Получаем курс от API
         try:
             current_rate = self.currency_fetcher.get_rate()
@@ -103,19 +106,37 @@ class ExchangeService:
             "last_rates": last_rates,  # список предыдущих запросов
         }
 
+    @staticmethod
+    def _render(data: dict, status: int = 200) -> JsonResponse:
+        """Формируем JsonResponse"""
+        with span("render"):
+            return JsonResponse(
+                data, status=status, json_dumps_params=RESPONSE_SETTINGS
+            )
+
     def get_response(self, _request=None) -> JsonResponse:
         """
         Получаем(выводим) ответ.
-        Возвращает JsonResponse с результатом работы сервиса
+        Возвращает JsonResponse с результатом работы сервиса.
+        Этапы запроса пишутся в лог, а при TRACING_SETTINGS["HEADER"]
+        (по умолчанию - при DEBUG) и в заголовок Server-Timing
         :param _request: None
         :return: JsonResponse
         """
+        trace = RequestTrace(self.currency_code)
+        with trace.activate():
+            response = self._build_response()
+        return trace.finish(response)
+
+    def _build_response(self) -> JsonResponse:
+        """Формируем ответ: из API, из БД при ошибке или ошибку кулдауна"""
 
         # Проверяем кэш
         can_request, message = self.cache_manager.check_make_request()
         if not can_request:
+            set_data_source("cache")
             last_rates = self.db_manager.get_last_rates(exclude_latest=False)
-            return JsonResponse(
+            return self._render(
                 {
                     "status": "error",
                     "currency": self.currency_code,
@@ -124,31 +145,27 @@ class ExchangeService:
                     "last_rates": last_rates,
                 },
                 status=429,
-                json_dumps_params=RESPONSE_SETTINGS,
             )
 
         # Если кэш разрешил, делаем запрос к API
         try:
             result = self.execute()
-            return JsonResponse(result, json_dumps_params=RESPONSE_SETTINGS)
+            return self._render(result)
         except Exception as e:
             # Ошибка при запросе к API
             try:
                 # Пытаемся сделать Fallback
                 fallback_data = self._get_fallback_data()
+                set_data_source(fallback_data["data_source"] or "error")
                 if fallback_data["current_rate"] is not None:
                     status_code = 200
                 else:
                     status_code = 503
 
-                return JsonResponse(
-                    fallback_data,
-                    json_dumps_params=RESPONSE_SETTINGS,
-                    status=status_code,
-                )
+                return self._render(fallback_data, status=status_code)
             except Exception as fallback_error:
                 # если даже fallback не сработал
-                return JsonResponse(
+                return self._render(
                     {
                         "status": "error",
                         "currency": self.currency_code,
@@ -162,5 +179,4 @@ class ExchangeService:
                         "last_rates": [],
                     },
                     status=429,
-                    json_dumps_params=RESPONSE_SETTINGS,
                 )
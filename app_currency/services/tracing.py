@@ -0,0 +1,196 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from app_currency.config import TRACING_SETTINGS
+
+logger = logging.getLogger(TRACING_SETTINGS["LOGGER"])
+
+# Трассировка текущего запроса
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar(
+    "current_trace", default=None
+)
+
+
+@contextmanager
+def span(name: str):
+    """Замеряем этап запроса, если трассировка активна"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_timing(name, time.perf_counter() - start)
+
+
+def set_data_source(data_source: str):
+    """Отмечаем источник данных ответа (api/cache/database)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.data_source = data_source
+
+
+class RequestTrace:
+    """Класс для трассировки одного запроса: время этапов,
+    количество запросов к БД и источник данных
+    """
+
+    # Имя отчета начинается с длительности запроса: "<мс>ms_..."
+    PROFILE_NAME_RE = re.compile(r"^(\d+)ms_")
+    _lock = threading.Lock()
+
+    def __init__(self, name: str):
+        """
+        :param name: имя запроса в логах и отчетах (например, код валюты)
+        """
+        self.name = name
+        self.timings: dict[str, float] = {}
+        self.query_count = 0
+        self.data_source = None
+        self.duration = 0.0
+        self.profiler = None
+
+    def add_timing(self, name: str, seconds: float):
+        """Добавляем время этапа (повторные этапы суммируются)"""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def _count_query(self, execute, sql, params, many, context):
+        """Обертка запросов к БД для подсчета их количества"""
+        self.query_count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def activate(self):
+        """Включаем трассировку (и профилирование) на время запроса"""
+        if (
+            TRACING_SETTINGS["PROFILE"]
+            and random.random() < TRACING_SETTINGS["PROFILE_SAMPLE_RATE"]
+        ):
+            self.profiler = cProfile.Profile()
+
+        token = _current_trace.set(self)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._count_query):
+                if self.profiler:
+                    try:
+                        self.profiler.enable()
+                    except ValueError:
+                        # Python 3.12+: профилировщик уже запущен
+                        # в другом потоке, продолжаем без профилирования
+                        self.profiler = None
+                try:
+                    yield self
+                finally:
+                    if self.profiler:
+                        self.profiler.disable()
+        finally:
+            self.duration = time.perf_counter() - start
+            _current_trace.reset(token)
+
+    def server_timing(self) -> str:
+        """Формируем значение заголовка Server-Timing"""
+        metrics = [
+            f"{name};dur={seconds * 1000:.2f}"
+            for name, seconds in self.timings.items()
+        ]
+        metrics.append(f"total;dur={self.duration * 1000:.2f}")
+        metrics.append(f'db;desc="queries={self.query_count}"')
+        metrics.append(f'source;desc="{self.data_source}"')
+        return ", ".join(metrics)
+
+    def to_dict(self) -> dict:
+        """Сериализация в словарь для структурированного лога"""
+        return {
+            "trace": self.name,
+            "duration_ms": round(self.duration * 1000, 2),
+            "timings_ms": {
+                name: round(seconds * 1000, 2)
+                for name, seconds in self.timings.items()
+            },
+            "query_count": self.query_count,
+            "data_source": self.data_source,
+        }
+
+    @staticmethod
+    def header_enabled() -> bool:
+        """Проверяем, нужно ли отдавать заголовок Server-Timing"""
+        header = TRACING_SETTINGS["HEADER"]
+        return settings.DEBUG if header is None else header
+
+    def finish(self, response):
+        """Пишем лог, отчет профилировщика и (опционально) Server-Timing"""
+        if self.header_enabled():
+            response["Server-Timing"] = self.server_timing()
+        logger.info(json.dumps(self.to_dict(), ensure_ascii=False))
+
+        if self.profiler:
+            try:
+                self._save_profile()
+            except OSError as e:
+                logger.warning(f"Не удалось сохранить профиль: {e}")
+        return response
+
+    @staticmethod
+    def get_profile_dir() -> Path:
+        """Каталог отчетов (относительный путь считается от BASE_DIR)"""
+        return Path(settings.BASE_DIR) / TRACING_SETTINGS["PROFILE_DIR"]
+
+    def _get_saved_profiles(self, directory: Path) -> list[tuple[int, Path]]:
+        """Возвращаем сохраненные отчеты (мс, файл) по возрастанию времени"""
+        profiles = []
+        for path in directory.glob("*ms_*.txt"):
+            match = self.PROFILE_NAME_RE.match(path.name)
+            if match:
+                profiles.append((int(match.group(1)), path))
+        return sorted(profiles)
+
+    def _save_profile(self):
+        """Сохраняем отчет, если запрос входит в N самых медленных.
+        Отбор идет по файлам в каталоге, поэтому учитывает отчеты
+        прошлых запусков и других процессов
+        """
+        top_n = TRACING_SETTINGS["PROFILE_TOP_N"]
+        duration_ms = round(self.duration * 1000)
+        directory = self.get_profile_dir()
+
+        with self._lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            profiles = self._get_saved_profiles(directory)
+            if len(profiles) >= top_n and duration_ms <= profiles[0][0]:
+                return
+
+            stamp = timezone.now().strftime("%Y%m%d_%H%M%S_%f")
+            path = directory / f"{duration_ms}ms_{self.name}_{stamp}.txt"
+
+            report = io.StringIO()
+            report.write(
+                json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+            )
+            report.write("\n\n")
+            stats = pstats.Stats(self.profiler, stream=report)
+            stats.sort_stats("cumulative").print_stats(30)
+            path.write_text(report.getvalue(), encoding="utf-8")
+
+            # Удаляем отчеты, вышедшие из N самых медленных
+            profiles = self._get_saved_profiles(directory)
+            for _, old_path in profiles[: max(len(profiles) - top_n, 0)]:
+                old_path.unlink(missing_ok=True)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Currency
+from .services.catalogue import CurrencyCatalogue
+
+
+@receiver([post_save, post_delete], sender=Currency)
+def invalidate_catalogue(**_kwargs):
+    """Сбрасываем индекс каталога при изменении валюты (в т.ч. из админки)"""
+    CurrencyCatalogue().invalidate()
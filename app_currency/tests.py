@@ -1,3 +1,246 @@
+import cProfile
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .config import TRACING_SETTINGS
+from .models import Currency, ExchangeRate
+from .services.catalogue import CurrencyCatalogue
+from .services.currency_fetchers import CBRRateFetcher
+from .services.exchange_service import ExchangeService
+from .services.tracing import RequestTrace
+
+# Фрагмент раздела "Valute" ответа ЦБ
+VALUTE = {
+    "USD": {
+        "CharCode": "USD",
+        "Nominal": 1,
+        "Name": "Доллар США",
+        "Value": 81.5,
+    },
+    "EUR": {"CharCode": "EUR", "Nominal": 1, "Name": "Евро", "Value": 94.2},
+    "JPY": {
+        "CharCode": "JPY",
+        "Nominal": 100,
+        "Name": "Японских иен",
+        "Value": 53.1,
+    },
+}
+
+
+class CurrencyCatalogueTest(TestCase):
+    """Тесты каталога валют"""
+
+    def setUp(self):
+        cache.clear()
+        self.catalogue = CurrencyCatalogue()
+
+    def test_sync_creates_disabled_except_supported(self):
+        self.catalogue.sync(VALUTE)
+
+        jpy = Currency.objects.get(code="JPY")
+        self.assertFalse(jpy.is_active)
+        self.assertEqual(jpy.nominal, 100)
+        self.assertEqual(jpy.name, "Японских иен")
+        self.assertTrue(Currency.objects.get(code="USD").is_active)
+        self.assertEqual(self.catalogue.get_codes(), {"USD", "EUR"})
+
+    def test_sync_marks_missing_unavailable(self):
+        self.catalogue.sync(VALUTE)
+        valute = {code: VALUTE[code] for code in ("USD", "JPY")}
+        self.catalogue.sync(valute)
+
+        eur = Currency.objects.get(code="EUR")
+        self.assertFalse(eur.is_available)
+        self.assertTrue(eur.is_active)
+        self.assertFalse(self.catalogue.is_supported("EUR"))
+
+    def test_sync_marks_returned_available(self):
+        self.catalogue.sync({"USD": VALUTE["USD"]})
+        self.catalogue.sync(VALUTE)
+
+        self.assertTrue(Currency.objects.get(code="EUR").is_available)
+        self.assertTrue(self.catalogue.is_supported("EUR"))
+
+    def test_set_active_invalidates_index(self):
+        self.catalogue.sync(VALUTE)
+        self.assertFalse(self.catalogue.is_supported("JPY"))
+
+        self.assertTrue(self.catalogue.set_active("jpy", True))
+        self.assertIsNone(cache.get(CurrencyCatalogue.INDEX_KEY))
+        self.assertTrue(self.catalogue.is_supported("JPY"))
+
+    def test_set_active_unknown_code(self):
+        self.assertFalse(self.catalogue.set_active("XXX", True))
+
+    @patch.object(Currency.objects, "bulk_create", side_effect=Exception)
+    def test_failed_sync_not_retried(self, _mock_bulk_create):
+        fetcher = CBRRateFetcher("USD")
+
+        with self.assertLogs(
+            "app_currency.services.currency_fetchers", "ERROR"
+        ):
+            fetcher._sync_catalogue(VALUTE)
+        self.assertFalse(self.catalogue.needs_sync())
+
+
+class CurrencyViewsTest(TestCase):
+    """Тесты представлений, зависящих от каталога"""
+
+    def setUp(self):
+        cache.clear()
+        CurrencyCatalogue().sync(VALUTE)
+
+    def test_available_currencies(self):
+        response = self.client.get(reverse("available_currencies"))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["Доступные валюты"], ["EUR", "USD"])
+        self.assertEqual(
+            data["Подробности"],
+            [
+                {"code": "EUR", "name": "Евро", "nominal": 1},
+                {"code": "USD", "name": "Доллар США", "nominal": 1},
+            ],
+        )
+
+    def test_disabled_currency_rejected(self):
+        response = self.client.get("/get-current-jpy/")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["available"], ["EUR", "USD"])
+
+
+@patch.dict(TRACING_SETTINGS, {"HEADER": True, "PROFILE": False})
+class TracingTest(TestCase):
+    """Тесты трассировки запроса"""
+
+    def setUp(self):
+        cache.clear()
+        self.service = ExchangeService(CBRRateFetcher("USD"))
+
+    @staticmethod
+    def get_metrics(response) -> dict:
+        """Разбираем Server-Timing в словарь {метрика: параметры}"""
+        metrics = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, _, params = metric.partition(";")
+            metrics[name] = params
+        return metrics
+
+    @patch("app_currency.services.currency_fetchers.requests.get")
+    def test_api_path(self, mock_get):
+        mock_get.return_value = MagicMock(
+            **{"json.return_value": {"Valute": VALUTE}}
+        )
+
+        with (
+            CaptureQueriesContext(connection) as queries,
+            self.assertLogs(TRACING_SETTINGS["LOGGER"], "INFO") as logs,
+        ):
+            response = self.service.get_response()
+
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["trace"], "USD")
+        self.assertEqual(record["data_source"], "api")
+        self.assertEqual(record["query_count"], len(queries.captured_queries))
+        self.assertIn("fetch", record["timings_ms"])
+        metrics = self.get_metrics(response)
+        for stage in (
+            "fetch",
+            "parse",
+            "catalogue_sync",
+            "save_rate",
+            "cache_update",
+            "history",
+            "render",
+            "total",
+        ):
+            self.assertIn(stage, metrics)
+        self.assertEqual(metrics["source"], 'desc="api"')
+        self.assertEqual(
+            metrics["db"], f'desc="queries={len(queries.captured_queries)}"'
+        )
+
+    def test_cooldown_path(self):
+        self.service.cache_manager.update_cache()
+
+        with (
+            self.assertNumQueries(1),
+            self.assertLogs(TRACING_SETTINGS["LOGGER"], "INFO"),
+        ):
+            response = self.service.get_response()
+
+        self.assertEqual(response.status_code, 429)
+        metrics = self.get_metrics(response)
+        self.assertIn("cache_check", metrics)
+        self.assertIn("history", metrics)
+        self.assertNotIn("fetch", metrics)
+        self.assertEqual(metrics["source"], 'desc="cache"')
+        self.assertEqual(metrics["db"], 'desc="queries=1"')
+
+    @patch(
+        "app_currency.services.currency_fetchers.requests.get",
+        side_effect=requests.ConnectionError,
+    )
+    def test_fallback_path(self, _mock_get):
+        ExchangeRate.objects.create(rate=80, currency="USD")
+
+        with self.assertLogs(TRACING_SETTINGS["LOGGER"], "INFO"):
+            response = self.service.get_response()
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data["data_source"], "database")
+        metrics = self.get_metrics(response)
+        self.assertIn("last_rate", metrics)
+        self.assertIn("history", metrics)
+        self.assertEqual(metrics["source"], 'desc="database"')
+
+    @patch(
+        "app_currency.services.currency_fetchers.requests.get",
+        side_effect=requests.ConnectionError,
+    )
+    def test_fallback_without_data(self, _mock_get):
+        with self.assertLogs(TRACING_SETTINGS["LOGGER"], "INFO") as logs:
+            response = self.service.get_response()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.get_metrics(response)["source"], 'desc="error"')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["data_source"], "error")
+
+    @patch.dict(TRACING_SETTINGS, {"HEADER": False})
+    def test_header_disabled(self):
+        self.service.cache_manager.update_cache()
+
+        with self.assertLogs(TRACING_SETTINGS["LOGGER"], "INFO"):
+            response = self.service.get_response()
+
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_save_profile_keeps_top_n(self):
+        with tempfile.TemporaryDirectory() as directory:
+            overrides = {"PROFILE_DIR": directory, "PROFILE_TOP_N": 2}
+            with patch.dict(TRACING_SETTINGS, overrides):
+                for duration in (0.1, 0.3, 0.05, 0.2, 0.15):
+                    trace = RequestTrace("USD")
+                    trace.profiler = cProfile.Profile()
+                    trace.profiler.runcall(sum, [1, 2])
+                    trace.duration = duration
+                    trace._save_profile()
 
-# Create your tests here.
+            names = sorted(path.name for path in Path(directory).iterdir())
+            self.assertEqual(len(names), 2)
+            self.assertTrue(names[0].startswith("200ms_USD_"))
+            self.assertTrue(names[1].startswith("300ms_USD_"))
@@ -1,8 +1,7 @@
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 
-from app_currency.config import SUPPORTED_CURRENCIES
-
+from .services.catalogue import CurrencyCatalogue
 from .services.currency_fetchers import CBRRateFetcher
 from .services.exchange_service import ExchangeService
 
@@ -10,29 +9,35 @@ from .services.exchange_service import ExchangeService
 @require_GET
 def get_currency_rate(request, currency_code: str):
     """
-    Универсальный способ для всех зарегистрированных валют.
+    Универсальный способ для всех включенных в каталоге валют.
     Пример: /get-current-<str:currency_code>/
     или /get-current-usd/
     """
     currency_code = currency_code.upper()
-    if currency_code not in SUPPORTED_CURRENCIES:
+    try:
+        # Fetcher сам проверяет, включена ли валюта в каталоге
+        fetcher = CBRRateFetcher(currency_code=currency_code)
+    except ValueError:
         return JsonResponse(
             {
                 "error": f"Валюта '{currency_code}' не поддерживается",
-                "available": SUPPORTED_CURRENCIES,
+                "available": sorted(CurrencyCatalogue().get_codes()),
             },
             status=400,
         )
 
-    fetcher = CBRRateFetcher(currency_code=currency_code)
     service = ExchangeService(fetcher)
     return service.get_response(request)
 
 
 @require_GET
 def get_available_currencies(_request):
-    """Возвращает список всех доступных валют"""
+    """Возвращает список всех доступных валют с метаданными"""
+    index = CurrencyCatalogue().get_index()
     return JsonResponse(
-        {"Доступные валюты": SUPPORTED_CURRENCIES},
+        {
+            "Доступные валюты": sorted(index),
+            "Подробности": [index[code] for code in sorted(index)],
+        },
         json_dumps_params={"ensure_ascii": False},
     )